@@ -2,13 +2,20 @@
 Tests for edge.py - P_win and EV calculations
 """
 
+import io
 import os
 import tempfile
 
+import numpy as np
 import pandas as pd
 import pytest
 
-from trading.edge import calculate_ev, calculate_ev_from_csv, calculate_p_win
+from trading.edge import (
+    calculate_ev,
+    calculate_ev_from_csv,
+    calculate_p_win,
+    calculate_p_win_vec,
+)
 
 
 class TestCalculatePWin:
@@ -139,6 +146,110 @@ class TestCalculatePWin:
         assert p_win > 0.5
 
 
+class TestCalculatePWinVec:
+    """Tests for calculate_p_win_vec function."""
+
+    def test_matches_scalar(self):
+        """Vectorized results should match the scalar function row by row."""
+        rows = [
+            (15, 16, 8.0, 89, 82, 89),
+            (8, 16, 5.0, 50, 50, 50),
+            (2, 16, 2.0, 20, 20, 20),
+            (0, 0, 5.0, 50, 50, 50),
+            (20, 20, 10.0, 100, 100, 100),
+        ]
+        buy, tot, smart, opt, soc, brk = (np.array(col) for col in zip(*rows))
+
+        p_win_vec = calculate_p_win_vec(buy, tot, smart, opt, soc, brk)
+
+        for i, row in enumerate(rows):
+            assert p_win_vec[i] == pytest.approx(calculate_p_win(*row), abs=1e-9)
+
+    def test_zero_ratings_row(self):
+        """Rows with zero total ratings should get no analysts adjustment."""
+        p_win = calculate_p_win_vec(
+            np.array([0]),
+            np.array([0]),
+            np.array([5.0]),
+            np.array([50.0]),
+            np.array([50.0]),
+            np.array([50.0]),
+        )
+
+        # All signals neutral, so exactly the neutral prior
+        assert p_win[0] == pytest.approx(0.5)
+
+    def test_float32_inputs_stay_float32(self):
+        """32-bit inputs (the typed CSV path) should compute in float32."""
+        p_win = calculate_p_win_vec(
+            np.array([15, 2], np.int32),
+            np.array([16, 16], np.int32),
+            np.array([8.0, 2.0], np.float32),
+            np.array([89.0, 20.0], np.float32),
+            np.array([82.0, 20.0], np.float32),
+            np.array([89.0, 20.0], np.float32),
+        )
+
+        assert p_win.dtype == np.float32
+        assert p_win[0] == pytest.approx(calculate_p_win(15, 16, 8.0, 89, 82, 89), abs=1e-6)
+        assert p_win[1] == pytest.approx(calculate_p_win(2, 16, 2.0, 20, 20, 20), abs=1e-6)
+
+    def test_columns_passed_to_scalar_api(self):
+        """calculate_p_win and calculate_ev should accept whole columns."""
+        df = pd.DataFrame(
+            {
+                "buy_ratings": [15, 2],
+                "total_ratings": [16, 16],
+                "smart_score": [8.0, 2.0],
+                "net_options_sentiment": [89.0, 20.0],
+                "net_social_sentiment": [82.0, 20.0],
+                "upside_breakout": [89.0, 20.0],
+                "win_r": [2.25, 1.5],
+                "loss_r": [-1.05, -1.0],
+            }
+        )
+
+        p_win = calculate_p_win(
+            df["buy_ratings"],
+            df["total_ratings"],
+            df["smart_score"],
+            df["net_options_sentiment"],
+            df["net_social_sentiment"],
+            df["upside_breakout"],
+        )
+        ev = calculate_ev(p_win, df["win_r"].to_numpy(), df["loss_r"].to_numpy())
+
+        assert len(p_win) == 2
+        assert p_win[0] == pytest.approx(calculate_p_win(15, 16, 8.0, 89, 82, 89), abs=1e-9)
+        assert ev[0] == pytest.approx(
+            calculate_ev(float(p_win[0]), 2.25, -1.05), abs=1e-9
+        )
+        assert ev[0] > ev[1]
+
+    def test_custom_weights(self):
+        """Custom weights should be applied in the vectorized path."""
+        custom_weights = {
+            "analysts_ratings": 0.5,
+            "smart_score": 0.1,
+            "net_options_sentiment": 0.1,
+            "net_social_sentiment": 0.1,
+            "upside_breakout": 0.2,
+        }
+
+        p_win = calculate_p_win_vec(
+            np.array([15]),
+            np.array([16]),
+            np.array([8.0]),
+            np.array([89.0]),
+            np.array([82.0]),
+            np.array([89.0]),
+            weights=custom_weights,
+        )
+
+        expected = calculate_p_win(15, 16, 8.0, 89, 82, 89, weights=custom_weights)
+        assert p_win[0] == pytest.approx(expected, abs=1e-9)
+
+
 class TestCalculateEV:
     """Tests for calculate_ev function."""
 
@@ -186,50 +297,50 @@ class TestCalculateEVFromCSV:
     """Tests for calculate_ev_from_csv function."""
 
     def test_basic_csv_processing(self):
-        """Test processing a valid CSV file."""
-        # Create temporary CSV
+        """Test processing valid CSV data from an in-memory buffer."""
         csv_data = """buy_ratings,total_ratings,smart_score,net_options_sentiment,net_social_sentiment,upside_breakout,win_r,loss_r
 15,16,8.0,89,82,89,2.25,-1.05
 12,15,7.5,75,70,80,2.0,-1.0"""
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
-            f.write(csv_data)
-            temp_path = f.name
+        df = calculate_ev_from_csv(io.StringIO(csv_data))
 
-        try:
-            df = calculate_ev_from_csv(temp_path)
+        # Check that required columns are present
+        assert "p_win" in df.columns
+        assert "ev" in df.columns
+        assert "recommendation" in df.columns
 
-            # Check that required columns are present
-            assert "p_win" in df.columns
-            assert "ev" in df.columns
-            assert "recommendation" in df.columns
+        # Check that we have 2 rows
+        assert len(df) == 2
 
-            # Check that we have 2 rows
-            assert len(df) == 2
+        # Check that p_win is between 0 and 1
+        assert all((df["p_win"] >= 0) & (df["p_win"] <= 1))
 
-            # Check that p_win is between 0 and 1
-            assert all((df["p_win"] >= 0) & (df["p_win"] <= 1))
+        # Check recommendations
+        assert all(df["recommendation"].isin(["take_trade", "skip_trade"]))
 
-            # Check recommendations
-            assert all(df["recommendation"].isin(["take_trade", "skip_trade"]))
+    def test_extra_columns_passed_through(self):
+        """Non-required columns such as a symbol identifier must be preserved."""
+        csv_data = """symbol,buy_ratings,total_ratings,smart_score,net_options_sentiment,net_social_sentiment,upside_breakout,win_r,loss_r
+AAPL,15,16,8.0,89,82,89,2.25,-1.05
+MSFT,12,15,7.5,75,70,80,2.0,-1.0"""
 
-        finally:
-            os.unlink(temp_path)
+        df = calculate_ev_from_csv(io.StringIO(csv_data))
+
+        assert list(df["symbol"]) == ["AAPL", "MSFT"]
+        assert "p_win" in df.columns
+        assert "ev" in df.columns
+
+        # Chunked streaming must keep the extra column as well
+        df_chunked = calculate_ev_from_csv(io.StringIO(csv_data), chunksize=1)
+        assert list(df_chunked["symbol"]) == ["AAPL", "MSFT"]
 
     def test_missing_column(self):
         """Test that missing required column raises error."""
         csv_data = """buy_ratings,total_ratings,smart_score,net_options_sentiment,net_social_sentiment,upside_breakout,win_r
 15,16,8.0,89,82,89,2.25"""
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
-            f.write(csv_data)
-            temp_path = f.name
-
-        try:
-            with pytest.raises(ValueError, match="Required column 'loss_r' not found"):
-                calculate_ev_from_csv(temp_path)
-        finally:
-            os.unlink(temp_path)
+        with pytest.raises(ValueError, match="Required column 'loss_r' not found"):
+            calculate_ev_from_csv(io.StringIO(csv_data))
 
     def test_output_file(self):
         """Test that output file is created when specified."""
@@ -263,43 +374,53 @@ class TestCalculateEVFromCSV:
         """Test that recommendation threshold works correctly."""
         csv_data = """buy_ratings,total_ratings,smart_score,net_options_sentiment,net_social_sentiment,upside_breakout,win_r,loss_r
 15,16,8.0,89,82,89,2.25,-1.05
+2,16,2.0,20,20,20,1.5,-1.0"""
+
+        df = calculate_ev_from_csv(io.StringIO(csv_data))
+
+        # First row should have high EV (take_trade)
+        assert df.iloc[0]["recommendation"] == "take_trade"
+        assert df.iloc[0]["ev"] >= 0.3
+
+        # Second row should have low EV (skip_trade)
+        assert df.iloc[1]["recommendation"] == "skip_trade"
+        assert df.iloc[1]["ev"] < 0.3
+
+    def test_chunked_matches_unchunked(self):
+        """Chunked streaming should produce the same results as a single read."""
+        csv_data = """buy_ratings,total_ratings,smart_score,net_options_sentiment,net_social_sentiment,upside_breakout,win_r,loss_r
+15,16,8.0,89,82,89,2.25,-1.05
+12,15,7.5,75,70,80,2.0,-1.0
 2,16,2.0,20,20,20,1.5,-1.0"""
 
         with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
-            f.write(csv_data)
-            temp_path = f.name
+            output_path = f.name
 
         try:
-            df = calculate_ev_from_csv(temp_path)
+            df_full = calculate_ev_from_csv(io.StringIO(csv_data))
+            df_chunked = calculate_ev_from_csv(
+                io.StringIO(csv_data), output_path=output_path, chunksize=2
+            )
 
-            # First row should have high EV (take_trade)
-            assert df.iloc[0]["recommendation"] == "take_trade"
-            assert df.iloc[0]["ev"] >= 0.3
+            pd.testing.assert_frame_equal(df_chunked, df_full)
 
-            # Second row should have low EV (skip_trade)
-            assert df.iloc[1]["recommendation"] == "skip_trade"
-            assert df.iloc[1]["ev"] < 0.3
+            # Output written incrementally should contain every row once
+            df_read = pd.read_csv(output_path)
+            assert len(df_read) == 3
+            assert "ev" in df_read.columns
 
         finally:
-            os.unlink(temp_path)
+            os.unlink(output_path)
 
     def test_empty_csv(self):
         """Test with empty CSV (only headers)."""
         csv_data = """buy_ratings,total_ratings,smart_score,net_options_sentiment,net_social_sentiment,upside_breakout,win_r,loss_r"""
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
-            f.write(csv_data)
-            temp_path = f.name
-
-        try:
-            df = calculate_ev_from_csv(temp_path)
-            # Should return empty dataframe with required columns
-            assert len(df) == 0
-            assert "p_win" in df.columns
-            assert "ev" in df.columns
-
-        finally:
-            os.unlink(temp_path)
+        df = calculate_ev_from_csv(io.StringIO(csv_data))
+        # Should return empty dataframe with required columns
+        assert len(df) == 0
+        assert "p_win" in df.columns
+        assert "ev" in df.columns
 
 
 class TestIntegration:
@@ -333,23 +454,15 @@ class TestIntegration:
 18,20,9.0,95,90,95,1.7,-1.0
 14,16,8.5,85,78,88,2.625,-1.05"""
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
-            f.write(csv_data)
-            temp_path = f.name
-
-        try:
-            df = calculate_ev_from_csv(temp_path)
-
-            # All rows should have valid calculations
-            assert len(df) == 5
-            assert all((df["p_win"] >= 0) & (df["p_win"] <= 1))
-            assert all(df["ev"].notna())
+        df = calculate_ev_from_csv(io.StringIO(csv_data))
 
-            # All should have valid recommendations
-            assert all(df["recommendation"].isin(["take_trade", "skip_trade"]))
-            # All rows have positive signals, so all should be take_trade
-            assert all(df["recommendation"] == "take_trade")
-            assert all(df["ev"] >= 0.3)
+        # All rows should have valid calculations
+        assert len(df) == 5
+        assert all((df["p_win"] >= 0) & (df["p_win"] <= 1))
+        assert all(df["ev"].notna())
 
-        finally:
-            os.unlink(temp_path)
+        # All should have valid recommendations
+        assert all(df["recommendation"].isin(["take_trade", "skip_trade"]))
+        # All rows have positive signals, so all should be take_trade
+        assert all(df["recommendation"] == "take_trade")
+        assert all(df["ev"] >= 0.3)
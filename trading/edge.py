@@ -12,10 +12,31 @@ EV Formula: EV = (p_win × win_r) + ((1 - p_win) × loss_r)
 """
 
 import argparse
+import functools
+import math
+import sys
 from pathlib import Path
+from typing import IO
 
 import numpy as np
 import pandas as pd
+from numba import njit, prange
+from scipy.special import expit
+
+try:
+    import numexpr as ne
+except ImportError:  # numexpr is optional; the NumPy path is equivalent
+    ne = None
+
+# pandas' pyarrow engine parses CSVs multi-threaded in C++; fall back to the
+# default C engine when pyarrow is not installed. The pyarrow engine supports
+# neither chunksize nor nrows, so only whole-file reads use it.
+try:
+    import pyarrow  # noqa: F401
+
+    _READ_CSV_KWARGS = {"engine": "pyarrow"}
+except ImportError:
+    _READ_CSV_KWARGS = {}
 
 # Default weights from README
 DEFAULT_WEIGHTS = {
@@ -26,19 +47,231 @@ DEFAULT_WEIGHTS = {
     "upside_breakout": 0.20,
 }
 
+# Weight keys in signal order, with the defaults unpacked once at import so the
+# hot paths do plain tuple loads instead of five dict lookups per call
+_WEIGHT_KEYS = (
+    "analysts_ratings",
+    "smart_score",
+    "net_options_sentiment",
+    "net_social_sentiment",
+    "upside_breakout",
+)
+_DEFAULT_WEIGHTS_TUPLE = tuple(DEFAULT_WEIGHTS[key] for key in _WEIGHT_KEYS)
+
+# Required CSV columns and their parse dtypes; declaring the dtypes up front
+# lets pandas skip inference for the compute columns. Extra columns (e.g. a
+# symbol identifier) are parsed normally and passed through to the result.
+REQUIRED_COLUMNS = [
+    "buy_ratings",
+    "total_ratings",
+    "smart_score",
+    "net_options_sentiment",
+    "net_social_sentiment",
+    "upside_breakout",
+    "win_r",
+    "loss_r",
+]
+CSV_DTYPES = {
+    "buy_ratings": "int32",
+    "total_ratings": "int32",
+    "smart_score": "float32",
+    "net_options_sentiment": "float32",
+    "net_social_sentiment": "float32",
+    "upside_breakout": "float32",
+    "win_r": "float32",
+    "loss_r": "float32",
+}
 
-def calculate_p_win(
-    buy_ratings: int,
-    total_ratings: int,
+
+def _clip_expr(x: str, lo: int, hi: int) -> str:
+    """Spell np.clip as nested where() calls, which numexpr lacks natively."""
+    return f"where({x} < {lo}, {lo}, where({x} > {hi}, {hi}, {x}))"
+
+
+# The whole P_win model (deltas, clips, weighted sum, sigmoid) as a single
+# numexpr expression, so one fused multi-threaded traversal replaces the
+# intermediate arrays the plain NumPy path materializes. tot_s is the
+# divide-safe total_ratings precomputed by the caller.
+_P_WIN_EXPR = (
+    "1 / (1 + exp(-("
+    f"w_a * {_clip_expr('where(tot > 0, (buy / tot_s) * (tot / 20) * 30, 0.0)', -30, 30)}"
+    f" + w_s * {_clip_expr('((smart - 5) / 5) * 20', -20, 20)}"
+    f" + w_o * {_clip_expr('((opt - 50) / 50) * 20', -20, 20)}"
+    f" + w_so * {_clip_expr('((soc - 50) / 50) * 20', -20, 20)}"
+    f" + w_b * {_clip_expr('((brk - 50) / 50) * 20', -20, 20)}"
+    ") / 100))"
+)
+
+
+# Default-weight coefficients folded at import for the specialized kernel:
+# each _K multiplies the raw signal straight into its weighted contribution,
+# and each _CAP is the delta cap pre-scaled by the same weight so that
+# clip-before-weighting semantics are preserved.
+_ANALYSTS_K = DEFAULT_WEIGHTS["analysts_ratings"] * 30.0 / 20.0
+_ANALYSTS_CAP = DEFAULT_WEIGHTS["analysts_ratings"] * 30.0
+_SMART_K = DEFAULT_WEIGHTS["smart_score"] * 20.0 / 5.0
+_SMART_CAP = DEFAULT_WEIGHTS["smart_score"] * 20.0
+_OPTIONS_K = DEFAULT_WEIGHTS["net_options_sentiment"] * 20.0 / 50.0
+_OPTIONS_CAP = DEFAULT_WEIGHTS["net_options_sentiment"] * 20.0
+_SOCIAL_K = DEFAULT_WEIGHTS["net_social_sentiment"] * 20.0 / 50.0
+_SOCIAL_CAP = DEFAULT_WEIGHTS["net_social_sentiment"] * 20.0
+_BREAKOUT_K = DEFAULT_WEIGHTS["upside_breakout"] * 20.0 / 50.0
+_BREAKOUT_CAP = DEFAULT_WEIGHTS["upside_breakout"] * 20.0
+
+
+@functools.lru_cache(maxsize=16)
+def _weights_tuple(frozen_items: frozenset) -> tuple:
+    """Resolve frozen weights-dict items to a tuple in _WEIGHT_KEYS order."""
+    weights = dict(frozen_items)
+    return tuple(weights.get(key, DEFAULT_WEIGHTS[key]) for key in _WEIGHT_KEYS)
+
+
+def _unpack_weights(weights: dict | None) -> tuple:
+    """Resolve a weights dict to a (analysts, smart, options, social, breakout) tuple.
+
+    Batch callers typically reuse the same custom dict across many rows, so
+    the resolution is memoized on the dict's contents.
+    """
+    if weights is None:
+        return _DEFAULT_WEIGHTS_TUPLE
+    return _weights_tuple(frozenset(weights.items()))
+
+
+@njit(cache=True, fastmath=True)
+def _p_win_kernel_default(
+    buy_ratings: float,
+    total_ratings: float,
     smart_score: float,
     net_options_sentiment: float,
     net_social_sentiment: float,
     upside_breakout: float,
-    weights: dict | None = None,
 ) -> float:
+    """Scalar P_win kernel specialized for DEFAULT_WEIGHTS.
+
+    The weights are baked in as compile-time constants (Numba freezes module
+    globals), letting LLVM fold them with the delta scaling factors.
+    """
+    # Analysts' Ratings: buy_proportion * (total/20) * 30 * w, caps pre-scaled
+    if total_ratings > 0:
+        analysts = (buy_ratings / total_ratings) * total_ratings * _ANALYSTS_K
+    else:
+        analysts = 0.0
+    analysts = min(_ANALYSTS_CAP, max(-_ANALYSTS_CAP, analysts))
+
+    smart = min(_SMART_CAP, max(-_SMART_CAP, (smart_score - 5.0) * _SMART_K))
+    options = min(_OPTIONS_CAP, max(-_OPTIONS_CAP, (net_options_sentiment - 50.0) * _OPTIONS_K))
+    social = min(_SOCIAL_CAP, max(-_SOCIAL_CAP, (net_social_sentiment - 50.0) * _SOCIAL_K))
+    breakout = min(_BREAKOUT_CAP, max(-_BREAKOUT_CAP, (upside_breakout - 50.0) * _BREAKOUT_K))
+
+    total_delta = analysts + smart + options + social + breakout
+    return 1.0 / (1.0 + math.exp(-total_delta / 100.0))
+
+
+@njit(cache=True, fastmath=True)
+def _p_win_kernel(
+    buy_ratings: float,
+    total_ratings: float,
+    smart_score: float,
+    net_options_sentiment: float,
+    net_social_sentiment: float,
+    upside_breakout: float,
+    w_analysts: float,
+    w_smart: float,
+    w_options: float,
+    w_social: float,
+    w_breakout: float,
+) -> float:
+    """Compiled scalar P_win kernel; weights are passed as plain floats."""
+    # Analysts' Ratings: (Buy Proportion × (Total Ratings / 20)) × 30
+    if total_ratings > 0:
+        analysts_delta = (buy_ratings / total_ratings) * (total_ratings / 20.0) * 30.0
+    else:
+        # No ratings available, so no adjustment from analysts' ratings
+        analysts_delta = 0.0
+    analysts_delta = min(30.0, max(-30.0, analysts_delta))  # Max ±30%
+
+    # Smart Score: ((Score − 5) / 5) × 20
+    smart_delta = min(20.0, max(-20.0, ((smart_score - 5.0) / 5.0) * 20.0))  # Max ±20%
+
+    # Net Options Sentiment: ((Score − 50) / 50) × 20
+    options_delta = min(20.0, max(-20.0, ((net_options_sentiment - 50.0) / 50.0) * 20.0))
+
+    # Net Social Sentiment: ((Score − 50) / 50) × 20
+    social_delta = min(20.0, max(-20.0, ((net_social_sentiment - 50.0) / 50.0) * 20.0))
+
+    # Upside Breakout: ((Score − 50) / 50) × 20
+    breakout_delta = min(20.0, max(-20.0, ((upside_breakout - 50.0) / 50.0) * 20.0))
+
+    # Weighted total delta
+    total_delta = (
+        analysts_delta * w_analysts
+        + smart_delta * w_smart
+        + options_delta * w_options
+        + social_delta * w_social
+        + breakout_delta * w_breakout
+    )
+
+    # Final P_win using sigmoid bounding: P_win = 1 / (1 + e^(-z))
+    return 1.0 / (1.0 + math.exp(-total_delta / 100.0))
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _batch_p_ev(
+    buy_ratings: np.ndarray,
+    total_ratings: np.ndarray,
+    smart_score: np.ndarray,
+    net_options_sentiment: np.ndarray,
+    net_social_sentiment: np.ndarray,
+    upside_breakout: np.ndarray,
+    win_r: np.ndarray,
+    loss_r: np.ndarray,
+    out_p: np.ndarray,
+    out_ev: np.ndarray,
+    w_analysts: float,
+    w_smart: float,
+    w_options: float,
+    w_social: float,
+    w_breakout: float,
+) -> None:
+    """Parallel batch kernel: fill out_p and out_ev in one fused pass.
+
+    Rows are split across cores with prange; the scalar kernel is inlined per
+    row, so there are no intermediate arrays at all.
+    """
+    for i in prange(buy_ratings.shape[0]):
+        p = _p_win_kernel(
+            buy_ratings[i],
+            total_ratings[i],
+            smart_score[i],
+            net_options_sentiment[i],
+            net_social_sentiment[i],
+            upside_breakout[i],
+            w_analysts,
+            w_smart,
+            w_options,
+            w_social,
+            w_breakout,
+        )
+        out_p[i] = p
+        out_ev[i] = p * win_r[i] + (1.0 - p) * loss_r[i]
+
+
+def calculate_p_win(
+    buy_ratings: int | np.ndarray,
+    total_ratings: int | np.ndarray,
+    smart_score: float | np.ndarray,
+    net_options_sentiment: float | np.ndarray,
+    net_social_sentiment: float | np.ndarray,
+    upside_breakout: float | np.ndarray,
+    weights: dict | None = None,
+) -> float | np.ndarray:
     """
     Calculate P_win from signal inputs using the blended model from README.
 
+    Whole columns (arrays or Series) can be passed directly in place of
+    scalars, in which case the vectorized implementation is used and an array
+    is returned — no df.apply needed.
+
     Args:
         buy_ratings: Number of buy ratings from analysts
         total_ratings: Total number of analyst ratings
@@ -51,57 +284,179 @@ def calculate_p_win(
     Returns:
         P_win probability (0.0 to 1.0)
     """
-    # Use default weights if not provided
+    # Array-like inputs route to the vectorized implementation
+    if np.ndim(buy_ratings) > 0:
+        return calculate_p_win_vec(
+            buy_ratings,
+            total_ratings,
+            smart_score,
+            net_options_sentiment,
+            net_social_sentiment,
+            upside_breakout,
+            weights=weights,
+        )
+
+    # Default weights take the specialized kernel with the weights baked in
     if weights is None:
-        weights = DEFAULT_WEIGHTS
+        return _p_win_kernel_default(
+            float(buy_ratings),
+            float(total_ratings),
+            float(smart_score),
+            float(net_options_sentiment),
+            float(net_social_sentiment),
+            float(upside_breakout),
+        )
+
+    # Dicts are not nopython-friendly, so unpack the weights once and pass
+    # plain floats to the kernel
+    w_analysts, w_smart, w_options, w_social, w_breakout = _unpack_weights(weights)
+
+    return _p_win_kernel(
+        float(buy_ratings),
+        float(total_ratings),
+        float(smart_score),
+        float(net_options_sentiment),
+        float(net_social_sentiment),
+        float(upside_breakout),
+        w_analysts,
+        w_smart,
+        w_options,
+        w_social,
+        w_breakout,
+    )
 
-    # Calculate individual deltas
-    # Analysts' Ratings: (Buy Proportion × (Total Ratings / 20)) × 30
-    if total_ratings > 0:
-        buy_proportion = buy_ratings / total_ratings
-        analysts_delta = (buy_proportion * (total_ratings / 20)) * 30
+
+def calculate_p_win_vec(
+    buy_ratings: np.ndarray,
+    total_ratings: np.ndarray,
+    smart_score: np.ndarray,
+    net_options_sentiment: np.ndarray,
+    net_social_sentiment: np.ndarray,
+    upside_breakout: np.ndarray,
+    weights: dict | None = None,
+) -> np.ndarray:
+    """
+    Vectorized calculate_p_win operating on whole columns at once.
+
+    Computes the same blended model as calculate_p_win but with NumPy array
+    ops, so a CSV of N rows costs a handful of C-level passes instead of N
+    Python calls.
+
+    Args:
+        buy_ratings: Array of buy rating counts
+        total_ratings: Array of total analyst rating counts
+        smart_score: Array of TipRanks Smart Scores (0-10)
+        net_options_sentiment: Array of Net Options Sentiment scores (0-100)
+        net_social_sentiment: Array of Net Social Sentiment scores (0-100)
+        upside_breakout: Array of Upside Breakout scores (0-100)
+        weights: Optional dict with custom weights (default uses README weights)
+
+    Returns:
+        Array of P_win probabilities (0.0 to 1.0)
+    """
+    w_analysts, w_smart, w_options, w_social, w_breakout = _unpack_weights(weights)
+
+    arrays = [
+        np.asarray(values)
+        for values in (
+            buy_ratings,
+            total_ratings,
+            smart_score,
+            net_options_sentiment,
+            net_social_sentiment,
+            upside_breakout,
+        )
+    ]
+
+    # Compute in float32 when every input fits in 32 bits (the typed CSV
+    # path): half the memory traffic and twice the SIMD lanes per pass, with
+    # precision to spare for a probability. Wider inputs keep float64.
+    if all(arr.dtype.itemsize <= 4 for arr in arrays):
+        compute_dtype = np.float32
     else:
-        # No ratings available, so no adjustment from analysts' ratings
-        analysts_delta = 0.0
-    analysts_delta = np.clip(analysts_delta, -30, 30)  # Max ±30%
+        compute_dtype = np.float64
+    (
+        buy_ratings,
+        total_ratings,
+        smart_score,
+        net_options_sentiment,
+        net_social_sentiment,
+        upside_breakout,
+    ) = (arr.astype(compute_dtype, copy=False) for arr in arrays)
+
+    if ne is not None:
+        # Fused single-pass evaluation: numexpr compiles the whole model into
+        # one expression tree and evaluates it multi-threaded. numexpr may
+        # promote intermediates to float64, so pin the result dtype here.
+        return ne.evaluate(
+            _P_WIN_EXPR,
+            local_dict={
+                "buy": buy_ratings,
+                "tot": total_ratings,
+                "tot_s": np.maximum(total_ratings, 1),
+                "smart": smart_score,
+                "opt": net_options_sentiment,
+                "soc": net_social_sentiment,
+                "brk": upside_breakout,
+                "w_a": w_analysts,
+                "w_s": w_smart,
+                "w_o": w_options,
+                "w_so": w_social,
+                "w_b": w_breakout,
+            },
+        ).astype(compute_dtype, copy=False)
+
+    # Analysts' Ratings: (Buy Proportion × (Total Ratings / 20)) × 30
+    # np.maximum guards the divide; np.where zeroes out rows with no ratings,
+    # keeping the whole column branchless. Clips write back into their own
+    # buffers (out=) so no extra temporaries are allocated.
+    safe_total = np.maximum(total_ratings, 1)
+    analysts_delta = np.where(
+        total_ratings > 0, (buy_ratings / safe_total) * (total_ratings / 20) * 30, 0.0
+    )
+    np.clip(analysts_delta, -30, 30, out=analysts_delta)  # Max ±30%
 
     # Smart Score: ((Score − 5) / 5) × 20
     smart_delta = ((smart_score - 5) / 5) * 20
-    smart_delta = np.clip(smart_delta, -20, 20)  # Max ±20%
+    np.clip(smart_delta, -20, 20, out=smart_delta)  # Max ±20%
 
     # Net Options Sentiment: ((Score − 50) / 50) × 20
     options_delta = ((net_options_sentiment - 50) / 50) * 20
-    options_delta = np.clip(options_delta, -20, 20)  # Max ±20%
+    np.clip(options_delta, -20, 20, out=options_delta)  # Max ±20%
 
     # Net Social Sentiment: ((Score − 50) / 50) × 20
     social_delta = ((net_social_sentiment - 50) / 50) * 20
-    social_delta = np.clip(social_delta, -20, 20)  # Max ±20%
+    np.clip(social_delta, -20, 20, out=social_delta)  # Max ±20%
 
     # Upside Breakout: ((Score − 50) / 50) × 20
     breakout_delta = ((upside_breakout - 50) / 50) * 20
-    breakout_delta = np.clip(breakout_delta, -20, 20)  # Max ±20%
+    np.clip(breakout_delta, -20, 20, out=breakout_delta)  # Max ±20%
 
-    # Weighted total delta
-    total_delta = (
-        analysts_delta * weights["analysts_ratings"]
-        + smart_delta * weights["smart_score"]
-        + options_delta * weights["net_options_sentiment"]
-        + social_delta * weights["net_social_sentiment"]
-        + breakout_delta * weights["upside_breakout"]
+    # Weighted total delta as one BLAS dot over the stacked (N×5) deltas
+    # instead of four Python-level multiply/add passes
+    deltas = np.stack(
+        [analysts_delta, smart_delta, options_delta, social_delta, breakout_delta], axis=-1
+    )
+    weights_vec = np.array(
+        [w_analysts, w_smart, w_options, w_social, w_breakout], dtype=compute_dtype
     )
+    total_delta = deltas @ weights_vec
 
     # Final P_win using sigmoid bounding: P_win = 1 / (1 + e^(-z))
-    # where z = total_delta / 100
-    z = total_delta / 100
-    p_win = 1 / (1 + np.exp(-z))
-
-    return float(p_win)
+    return expit(total_delta / 100)
 
 
-def calculate_ev(p_win: float, win_r: float, loss_r: float) -> float:
+def calculate_ev(
+    p_win: float | np.ndarray,
+    win_r: float | np.ndarray,
+    loss_r: float | np.ndarray,
+) -> float | np.ndarray:
     """
     Calculate expected value (EV) in R-multiples.
 
+    Accepts scalars or whole columns (arrays or Series); the arithmetic
+    broadcasts either way.
+
     Args:
         p_win: Win probability (0.0 to 1.0)
         win_r: Average R-multiple on wins
@@ -114,46 +469,127 @@ def calculate_ev(p_win: float, win_r: float, loss_r: float) -> float:
     return ev
 
 
+def _rewind(csv_path: str | Path | IO[str]) -> None:
+    """Rewind a file-like input so it can be read again; a no-op for paths."""
+    if hasattr(csv_path, "seek"):
+        csv_path.seek(0)
+
+
+def _validate_columns(df: pd.DataFrame) -> None:
+    """Raise if any required column is missing from a frame of signal rows."""
+    missing = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"Required column '{missing[0]}' not found in CSV")
+
+
+def _read_csv_full(csv_path: str | Path | IO[str]) -> pd.DataFrame:
+    """Read a whole signal CSV, preferring the multi-threaded pyarrow engine."""
+    if _READ_CSV_KWARGS:
+        try:
+            return pd.read_csv(csv_path, dtype=CSV_DTYPES, **_READ_CSV_KWARGS)
+        except pd.errors.ParserError:
+            # pyarrow rejects header-only files; retry with the default
+            # engine, which returns an empty frame instead
+            _rewind(csv_path)
+    return pd.read_csv(csv_path, dtype=CSV_DTYPES)
+
+
+def _flush(df_chunk: pd.DataFrame, path: str | Path, first: bool) -> None:
+    """
+    Append a scored chunk to the output CSV, writing the header only once.
+
+    Fixing float_format keeps every flush's string buffer small and the row
+    format identical across chunks.
+    """
+    df_chunk.to_csv(
+        path,
+        mode="w" if first else "a",
+        header=first,
+        index=False,
+        float_format="%.6f",
+        lineterminator="\n",
+    )
+
+
+def _score_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Add 'p_win', 'ev' and 'recommendation' columns to a frame of signal rows."""
+    # Calculate P_win and EV together in one parallel fused pass over
+    # contiguous float32 columns, bypassing pandas' per-column machinery;
+    # the outputs are preallocated and assigned back zero-copy
+    n = len(df)
+    out_p = np.empty(n, dtype=np.float32)
+    out_ev = np.empty(n, dtype=np.float32)
+    _batch_p_ev(
+        df["buy_ratings"].to_numpy(dtype=np.float32),
+        df["total_ratings"].to_numpy(dtype=np.float32),
+        df["smart_score"].to_numpy(dtype=np.float32),
+        df["net_options_sentiment"].to_numpy(dtype=np.float32),
+        df["net_social_sentiment"].to_numpy(dtype=np.float32),
+        df["upside_breakout"].to_numpy(dtype=np.float32),
+        df["win_r"].to_numpy(dtype=np.float32),
+        df["loss_r"].to_numpy(dtype=np.float32),
+        out_p,
+        out_ev,
+        *_DEFAULT_WEIGHTS_TUPLE,
+    )
+    df["p_win"] = out_p
+
+    # EV = (p_win × win_r) + ((1 - p_win) × loss_r), filled by the kernel
+    df["ev"] = out_ev
+
+    # Add recommendation based on EV threshold (0.3-0.5R buffer)
+    df["recommendation"] = np.where(out_ev >= 0.3, "take_trade", "skip_trade")
+
+    return df
+
+
 def calculate_ev_from_csv(
-    csv_path: str | Path, output_path: str | Path | None = None
+    csv_path: str | Path | IO[str],
+    output_path: str | Path | None = None,
+    chunksize: int | None = None,
 ) -> pd.DataFrame:
     """
     Calculate P_win from signal inputs, then calculate EV for each row in a CSV file.
 
     Args:
-        csv_path: Path to input CSV file
+        csv_path: Path to input CSV file, or an open file-like object such as
+            io.StringIO — pandas reads either, so callers can score in-memory
+            CSV data without touching disk
         output_path: Optional path to save results CSV (default: None, returns DataFrame only)
+        chunksize: Optional number of rows to stream per batch; bounds peak
+            memory on very large files (default: None, reads the file at once)
 
     Returns:
         DataFrame with original columns plus 'p_win', 'ev', and 'recommendation' columns
     """
-    # Column names (hardcoded)
-    buy_ratings_col = "buy_ratings"
-    total_ratings_col = "total_ratings"
-    smart_score_col = "smart_score"
-    net_options_sentiment_col = "net_options_sentiment"
-    net_social_sentiment_col = "net_social_sentiment"
-    upside_breakout_col = "upside_breakout"
-    win_r_col = "win_r"
-    loss_r_col = "loss_r"
-
-    # Read CSV
-    df = pd.read_csv(csv_path)
+    # The required columns parse with declared dtypes (no inference); any
+    # extra columns ride along untouched and reappear in the result
+    if chunksize is not None:
+        # Stream in row batches: score each chunk and append it to the
+        # output file as it arrives so peak memory stays bounded
+        chunks = []
+        first = True
+        for chunk in pd.read_csv(csv_path, dtype=CSV_DTYPES, chunksize=chunksize):
+            if not chunks:
+                _validate_columns(chunk)
+            chunk = _score_frame(chunk)
+            if output_path:
+                _flush(chunk, output_path, first)
+                first = False
+            chunks.append(chunk)
+        if chunks:
+            if output_path:
+                print(f"Results saved to {output_path}")
+            return pd.concat(chunks, ignore_index=True)
+        # Zero data rows: rebuild the typed header frame and fall through
+        # to the shared empty-frame handling below
+        _rewind(csv_path)
+        df = pd.read_csv(csv_path, nrows=0, dtype=CSV_DTYPES)
+    else:
+        df = _read_csv_full(csv_path)
 
     # Validate required columns
-    required_cols = [
-        buy_ratings_col,
-        total_ratings_col,
-        smart_score_col,
-        net_options_sentiment_col,
-        net_social_sentiment_col,
-        upside_breakout_col,
-        win_r_col,
-        loss_r_col,
-    ]
-    for col in required_cols:
-        if col not in df.columns:
-            raise ValueError(f"Required column '{col}' not found in CSV")
+    _validate_columns(df)
 
     # Handle empty DataFrame
     if len(df) == 0:
@@ -161,37 +597,15 @@ def calculate_ev_from_csv(
         df["ev"] = pd.Series(dtype=float)
         df["recommendation"] = pd.Series(dtype=str)
         if output_path:
-            df.to_csv(output_path, index=False)
+            _flush(df, output_path, first=True)
             print(f"Results saved to {output_path}")
         return df
 
-    # Calculate P_win for each row
-    df["p_win"] = df.apply(
-        lambda row: calculate_p_win(
-            buy_ratings=int(row[buy_ratings_col]),
-            total_ratings=int(row[total_ratings_col]),
-            smart_score=float(row[smart_score_col]),
-            net_options_sentiment=float(row[net_options_sentiment_col]),
-            net_social_sentiment=float(row[net_social_sentiment_col]),
-            upside_breakout=float(row[upside_breakout_col]),
-        ),
-        axis=1,
-    )
-
-    # Calculate EV for each row
-    df["ev"] = df.apply(
-        lambda row: calculate_ev(
-            p_win=float(row["p_win"]), win_r=float(row[win_r_col]), loss_r=float(row[loss_r_col])
-        ),
-        axis=1,
-    )
-
-    # Add recommendation based on EV threshold (0.3-0.5R buffer)
-    df["recommendation"] = df["ev"].apply(lambda x: "take_trade" if x >= 0.3 else "skip_trade")
+    df = _score_frame(df)
 
     # Save to file if output path provided
     if output_path:
-        df.to_csv(output_path, index=False)
+        _flush(df, output_path, first=True)
         print(f"Results saved to {output_path}")
 
     return df
@@ -252,4 +666,8 @@ Example:
 
 
 if __name__ == "__main__":
+    # Running as a script: make the package root importable so Numba's
+    # on-disk kernel cache, written when this file is imported as
+    # trading.edge (e.g. by the tests), can be loaded rather than erroring
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
     main()